@@ -16,10 +16,13 @@ To reproduce the bug, run the following command:
 
 To debug the segfault, run the following command:
 
-    $ gdb -ex=r --args python3 test.py
+    $ gdb -ex=r --args python3 test.py gpu19
 
-This script will generate a 512x512 image of a triangle and a plane. The plane
-is textured with a 19x19 noise texture. The triangle is solid black.
+For every config named on the command line (default: every entry in
+`configs`), this script will generate a 512x512 image (`image_<name>.png`) of
+a triangle and a plane. The plane is textured with an NxN noise texture, where
+N is the config's resolution. The triangle is solid black. The configs run in
+one process, sharing the OSPRay devices.
 
 The scene is configured so the plane is in front with the triangle behind it.
 This way, if the texture is transparent, the triangle will be visible through
@@ -29,14 +32,15 @@ the plane.
 
 #%%
 
-import ctypes
 import contextlib
 import dataclasses
+import mmap
 import numpy as np
 import scipy.ndimage
-import itertools
 import PIL.Image
 import pathlib
+import sys
+import typing
 
 import ospray
 
@@ -68,14 +72,14 @@ configs['gpu19'] = Config(gpu=True, resolution=19)
 
 #%%
 
-config = configs['cpu1']
+# Option-like arguments (e.g. ipykernel's --f=...json when run as cells) are
+# not config names.
+names = [arg for arg in sys.argv[1:] if not arg.startswith('-')]
+names = names or list(configs)
 
-
-#%%
-
-stack = contextlib.ExitStack()
-enter = stack.enter_context
-defer = stack.callback
+for n in names:
+    if n not in configs:
+        sys.exit(f'unknown config {n!r}; choose from {list(configs)}')
 
 
 #%%
@@ -83,466 +87,563 @@ defer = stack.callback
 lib = ospray.load_library('libospray.so')
 lib.ospInit(None, None)
 
-if config.gpu:
-    lib.ospLoadModule(b'gpu')
-
+# Devices are created once and shared by every config; the GPU module and
+# device are only brought up the first time a GPU config is seen.
+devices = {}
+devices[False] = lib.ospGetCurrentDevice()
 
-#%%
+# Framebuffers live on a device, so they are cached per (gpu, w, h) and
+# reused by every config that renders at that size on that device.
+framebuffers = {}
 
-if config.gpu:
-    device = lib.ospNewDevice(b'gpu')
-    # defer(lib.ospDeviceRelease, device)
-    lib.ospDeviceCommit(device)
+# Likewise, the OSPData for geometry that is identical in every config is made
+# once per device. Anything it must keep alive is held by the session stack.
+static = {}
 
-    lib.ospSetCurrentDevice(device)
+session = contextlib.ExitStack()
 
 
 #%%
 
-def Data(
+# Bytes per item of the OSPData element types built from numpy arrays here.
+ITEMSIZE = {
+    lib.OSP_VEC2F: 2 * 4,
+    lib.OSP_VEC3F: 3 * 4,
+    lib.OSP_VEC4F: 4 * 4,
+    lib.OSP_VEC2UI: 2 * 4,
+    lib.OSP_VEC3UI: 3 * 4,
+    lib.OSP_VEC4UI: 4 * 4,
+}
+
+def SharedData(
     array: np.ndarray,
+    type: lib.OSPDataType,
+    n1: int,
+    s1: int,
+    n2: int = 1,
+    s2: int = 0,
     /,
     *,
-    type: lib.OSPDataType,
-    share: bool=False,
+    owner: contextlib.ExitStack,
 ) -> lib.OSPData:
-    # print("DATA 1")
-    if isinstance(array, list):
-        for i, x in enumerate(array):
-            if not isinstance(x, lib.OSPObject):
-                break
+    # OSPRay reads straight out of the numpy buffer, so the owning stack holds
+    # on to it until after the handle (released by the caller's later defer)
+    # is gone.
+    owner.enter_context(contextlib.nullcontext(array))
 
-        else:
-            array = (ctypes.cast(x, ctypes.c_void_p).value for x in array)
-            assert(array != None)
-            array = np.fromiter(array, dtype=np.uintp)
-            return Data(array, type=type)
+    # print(f'ospNewSharedData({array.ctypes.data}, {type},  {n1}, {s1},  {n2}, {s2},  1, 0,  {None}, {None})')
+    data = lib.ospNewSharedData(
+        array.ctypes.data, type,
+        n1, s1,
+        n2, s2,
+        1, 0,
+        None, None
+    )
+    lib.ospCommit(data)
+    return data
 
-        array = np.asarray(array)
-        return Data(array, type=type)
 
-    # print("DATA 2")
-    if len(array.shape) == 0:
-        array = array[None, None, None]
+def VectorData(
+    array: typing.Union[np.ndarray, tuple[np.ndarray, ...]],
+    /,
+    *,
+    type: lib.OSPDataType,
+    owner: contextlib.ExitStack,
+) -> lib.OSPData:
+    """1D data of vecN items, from an (N, k) array or k SoA columns"""
+    # Vertex attributes are kept as separate SoA columns and only interleaved
+    # into one vecN per item here, at the OSPRay boundary.
+    if isinstance(array, tuple):
+        array = np.stack(array, axis=-1)
+
+    array = np.ascontiguousarray(array)
+    assert(array.ndim == 2)
+    assert(array.shape[1] * array.itemsize == ITEMSIZE[type])
+    return SharedData(
+        array, type,
+        array.shape[0], array.strides[0],
+        owner=owner,
+    )
+
+
+def ObjectData(
+    objects: list[lib.OSPObject],
+    /,
+    *,
+    type: lib.OSPDataType,
+    owner: contextlib.ExitStack,
+) -> lib.OSPData:
+    """1D data of OSPRay object handles"""
+    # OSPObject is a ctypes pointer, so a ctypes array of them is already a
+    # packed array of handles; frombuffer views it (and keeps it alive).
+    handles = np.frombuffer(
+        (lib.OSPObject * len(objects))(*objects),
+        dtype=np.uintp,
+    )
 
-    elif len(array.shape) == 1:
-        array = array[:, None, None]
+    return SharedData(
+        handles, type,
+        handles.shape[0], handles.strides[0],
+        owner=owner,
+    )
 
-    elif len(array.shape) == 2:
-        array = array[:, :, None]
 
-    elif len(array.shape) == 3:
-        array = array[:, :, :]
+def TextureData(
+    rgb: np.ndarray,
+    /,
+    *,
+    type: lib.OSPDataType,
+) -> lib.OSPData:
+    """2D data of texels, copied into OSPRay-owned memory
 
-    else:
-        raise NotImplementedError()
-    # print("DATA 3")
+    This copy is the one that misbehaves on the GPU device, so unlike the
+    other helpers it does not share the numpy buffer.
+    """
+    rgb = np.ascontiguousarray(rgb)
+    assert(rgb.ndim == 3)
+    assert(rgb.shape[2] * rgb.itemsize == ITEMSIZE[type])
 
-    # print(f'ospNewSharedData({array.ctypes.data} ({array.ravel()}), {type},  {array.shape[0]}, {array.strides[0]},  {array.shape[1]}, {array.strides[1]},  {array.shape[2]}, {array.strides[2]},  {None}, {None})')
+    # print(f'ospNewSharedData({rgb.ctypes.data}, {type},  {rgb.shape[0]}, {rgb.strides[0]},  {rgb.shape[1]}, {rgb.strides[1]},  1, 0,  {None}, {None})')
     src = lib.ospNewSharedData(
-        array.ctypes.data, type,
-        array.shape[0], array.strides[0],
-        array.shape[1], array.strides[1],
-        array.shape[2], array.strides[2],
+        rgb.ctypes.data, type,
+        rgb.shape[0], rgb.strides[0],
+        rgb.shape[1], rgb.strides[1],
+        1, 0,
         None, None
     )
-    lib.ospCommit(src)
-    # print(f"DATA 4: type: {type}")
-    if share:
-        return src
 
-    dst = lib.ospNewData(type, *array.shape)
-    lib.ospCommit(dst)
+    # ospCopyData needs neither side committed; only dst is handed out.
+    dst = lib.ospNewData(type, rgb.shape[0], rgb.shape[1], 1)
     lib.ospCopyData(src, dst, 0, 0, 0)
     lib.ospCommit(dst)
-    # print("DATA 5")
 
     lib.ospRelease(src)
-    # print("DATA 6")
     return dst
 
 
+def StaticData(
+    array: typing.Union[np.ndarray, tuple[np.ndarray, ...]],
+    /,
+    *,
+    type: lib.OSPDataType,
+    gpu: bool,
+) -> lib.OSPData:
+    key = (gpu, id(array), type)
+    if key not in static:
+        static[key] = VectorData(array, type=type, owner=session)
+
+    return static[key]
+
+
 #%%
 
 def Noise(
     size: int,
     tint: tuple[float, float, float] = (0.0, 0.0, 0.0),
+    *,
+    out: typing.Optional[np.ndarray] = None,
 ) -> np.ndarray:
-    rgb = np.empty(
-        shape=(size, size),
-        dtype=[
-            ('r', 'f4'), ('g', 'f4'), ('b', 'f4'),
-        ],
-    )
+    if out is None:
+        out = np.empty(
+            shape=(size, size, 3),
+            dtype=np.float32,
+        )
+
+    rgb = out
+    assert(rgb.shape == (size, size, 3) and rgb.dtype == np.float32)
 
-    np.random.seed(0)
-    rgb['r'] = np.random.rand(size, size)
-    rgb['g'] = np.random.rand(size, size)
-    rgb['b'] = np.random.rand(size, size)
+    # noise, drawn as float32 straight into rgb
+    rng = np.random.default_rng(0)
+    rng.random(dtype=np.float32, out=rgb)
 
     # tint
-    rgb['r'] += tint[0]
-    rgb['g'] += tint[1]
-    rgb['b'] += tint[2]
+    rgb += np.asarray(tint, dtype=np.float32)
 
     # clamp
-    rgb['r'] = np.clip(rgb['r'], 0, 1)
-    rgb['g'] = np.clip(rgb['g'], 0, 1)
-    rgb['b'] = np.clip(rgb['b'], 0, 1)
+    np.clip(rgb, 0.0, 1.0, out=rgb)
 
-    # gaussian convolution
+    # gaussian convolution (2D only; sigma=0 leaves the channel axis alone,
+    # truncate=3 gives a 7-tap kernel instead of the default 9)
     for _ in range(3):
-        rgb['r'] = scipy.ndimage.gaussian_filter(rgb['r'], 1)
-        rgb['g'] = scipy.ndimage.gaussian_filter(rgb['g'], 1)
-        rgb['b'] = scipy.ndimage.gaussian_filter(rgb['b'], 1)
+        scipy.ndimage.gaussian_filter(
+            rgb,
+            sigma=(1, 1, 0),
+            truncate=3.0,
+            output=rgb,
+        )
 
     return rgb
 
 
 #%%
 
-position = np.array([
-    (0.3, 0.3, -0.3),
-    (0.7, 0.3, -0.3),
-    (0.5, 0.7, -0.3),
-], dtype=[
-    ('x', 'f4'), ('y', 'f4'), ('z', 'f4'),
-])
+class MappedFrameBuffer:
+    """Zero-copy (h, w, 4) uint8 view of an ospMapFrameBuffer'd SRGBA buffer
 
-index = np.array([
-    (0, 1, 2),
-], dtype=[
-    ('a', 'u4'), ('b', 'u4'), ('c', 'u4'),
-])
+    Anything made from it (np.asarray, PIL.Image.fromarray) reads OSPRay's
+    memory directly, so it must not be used after ospUnmapFrameBuffer.
+    """
+
+    def __init__(self, rgba: int, w: int, h: int):
+        self.__array_interface__ = {
+            'data': (rgba, True),
+            'shape': (h, w, 4),
+            'typestr': '|u1',
+            'version': 3,
+        }
 
 
 #%%
 
-position = Data(position, type=lib.OSP_VEC3F)
-defer(lib.ospRelease, position)
-lib.ospCommit(position)
+triangle_position = (
+    np.array([0.3, 0.7, 0.5], dtype=np.float32),  # x
+    np.array([0.3, 0.3, 0.7], dtype=np.float32),  # y
+    np.array([-0.3, -0.3, -0.3], dtype=np.float32),  # z
+)
+
+triangle_index = np.array([
+    (0, 1, 2),
+], dtype=np.uint32)
 
 
 #%%
 
-index = Data(index, type=lib.OSP_VEC4UI-1)
-defer(lib.ospRelease, index)
-lib.ospCommit(index)
+NROW = 16
+NCOL = 16
+NMAT = 256
 
+NVERT = (NROW + 1) * (NCOL + 1)
+NQUAD = NROW * NCOL
 
-#%%
+u, v = np.meshgrid(
+    np.arange(NCOL + 1, dtype=np.float32) / NCOL,
+    np.arange(NROW + 1, dtype=np.float32) / NROW,
+)
 
-geometry = lib.ospNewGeometry(b'mesh')
-defer(lib.ospRelease, geometry)
-lib.ospSetObject(geometry, b'vertex.position', position)
-lib.ospSetObject(geometry, b'index', index)
-lib.ospCommit(geometry)
+u, v = u.ravel(), v.ravel()
 
+plane_position = (u, v, np.zeros_like(u))
+plane_texcoord = (u, v)
 
-#%%
+# vertex index of (row, col) is row * (NCOL + 1) + col
+vert = np.arange(NVERT, dtype=np.uint32).reshape(NROW + 1, NCOL + 1)
 
-material = lib.ospNewMaterial(b'obj')
-defer(lib.ospRelease, material)
-lib.ospSetVec3f(material, b'kd', *(
-    0.0, 0.0, 0.0,
-))
-lib.ospCommit(material)
+plane_index = np.stack([
+    vert[:-1, :-1],
+    vert[1:, :-1],
+    vert[1:, 1:],
+    vert[:-1, 1:],
+], axis=-1).reshape(NQUAD, 4)
 
 
 #%%
 
-geomodel = lib.ospNewGeometricModel(None)
-defer(lib.ospRelease, geomodel)
-lib.ospSetObject(geomodel, b'geometry', geometry)
-lib.ospSetObject(geomodel, b'material', material)
-lib.ospCommit(geomodel)
+# A single page-aligned host buffer, big enough for the largest texture. Every
+# config generates its noise straight into (a prefix of) it, so OSPRay always
+# reads the texture from the same tightly-packed, aligned memory.
+NMAX = max(configs[name].resolution for name in names)
+
+staging = np.frombuffer(
+    mmap.mmap(-1, NMAX * NMAX * 3 * np.dtype(np.float32).itemsize),
+    dtype=np.float32,
+)
 
 
 #%%
 
-geomodels = Data([
-    geomodel,
-], type=lib.OSP_GEOMETRIC_MODEL)
-defer(lib.ospRelease, geomodels)
-lib.ospCommit(geomodels)
+for name in names:
+    config = configs[name]
 
+    stack = contextlib.ExitStack()
+    enter = stack.enter_context
+    defer = stack.callback
 
-#%%
+    if config.gpu not in devices:
+        lib.ospLoadModule(b'gpu')
 
-group = lib.ospNewGroup()
-defer(lib.ospRelease, group)
-lib.ospSetObject(group, b'geometry', geomodels)
-lib.ospCommit(group)
+        device = lib.ospNewDevice(b'gpu')
+        # defer(lib.ospDeviceRelease, device)
+        lib.ospDeviceCommit(device)
 
+        devices[config.gpu] = device
 
-#%%
+    lib.ospSetCurrentDevice(devices[config.gpu])
 
-triangle = \
-instance = lib.ospNewInstance(None)
-defer(lib.ospRelease, instance)
-lib.ospSetObject(instance, b'group', group)
-lib.ospCommit(instance)
 
+    #%%
 
-#%%
+    position = StaticData(triangle_position, type=lib.OSP_VEC3F, gpu=config.gpu)
 
-NROW = 16
-NCOL = 16
-NMAT = 256
 
-NVERT = (NROW + 1) * (NCOL + 1)
-NQUAD = NROW * NCOL
+    #%%
 
-position = np.empty(
-    shape=NVERT,
-    dtype=[
-        ('x', 'f4'), ('y', 'f4'), ('z', 'f4'),
-    ],
-)
+    index = StaticData(triangle_index, type=lib.OSP_VEC4UI-1, gpu=config.gpu)
 
-texcoord = np.empty(
-    shape=NVERT,
-    dtype=[
-        ('u', 'f4'), ('v', 'f4'),
-    ],
-)
 
-index = np.empty(
-    shape=NQUAD,
-    dtype=[
-        ('a', 'u4'), ('b', 'u4'), ('c', 'u4'), ('d', 'u4'),
-    ],
-)
+    #%%
 
+    geometry = lib.ospNewGeometry(b'mesh')
+    defer(lib.ospRelease, geometry)
+    lib.ospSetObject(geometry, b'vertex.position', position)
+    lib.ospSetObject(geometry, b'index', index)
+    lib.ospCommit(geometry)
 
-#%%
 
-VERT = iter(itertools.count())
-QUAD = iter(itertools.count())
-
-for row in range(NROW + 1):
-    for col in range(NCOL + 1):
-        i = next(VERT)
-        position[i] = (col / NCOL, row / NROW, 0)
-        texcoord[i] = (col / NCOL, row / NROW)
-
-for row in range(NROW):
-    for col in range(NCOL):
-        i = next(QUAD)
-        index[i] = (
-            col + (row + 0) * (NCOL + 1),
-            col + (row + 1) * (NCOL + 1),
-            col + 1 + (row + 1) * (NCOL + 1),
-            col + 1 + (row + 0) * (NCOL + 1),
-        )
+    #%%
 
+    material = lib.ospNewMaterial(b'obj')
+    defer(lib.ospRelease, material)
+    lib.ospSetVec3f(material, b'kd', *(
+        0.0, 0.0, 0.0,
+    ))
+    lib.ospCommit(material)
 
-#%%
 
-position = Data(position, type=lib.OSP_VEC3F)
-defer(lib.ospRelease, position)
-lib.ospCommit(position)
+    #%%
 
+    geomodel = lib.ospNewGeometricModel(None)
+    defer(lib.ospRelease, geomodel)
+    lib.ospSetObject(geomodel, b'geometry', geometry)
+    lib.ospSetObject(geomodel, b'material', material)
+    lib.ospCommit(geomodel)
 
-#%%
 
-texcoord = Data(texcoord, type=lib.OSP_VEC2F)
-defer(lib.ospRelease, texcoord)
-lib.ospCommit(texcoord)
+    #%%
 
+    geomodels = ObjectData([
+        geomodel,
+    ], type=lib.OSP_GEOMETRIC_MODEL, owner=stack)
+    defer(lib.ospRelease, geomodels)
 
-#%%
 
-index = Data(index, type=lib.OSP_VEC4UI)
-defer(lib.ospRelease, index)
-lib.ospCommit(index)
+    #%%
 
+    group = lib.ospNewGroup()
+    defer(lib.ospRelease, group)
+    lib.ospSetObject(group, b'geometry', geomodels)
+    lib.ospCommit(group)
 
-#%%
 
-geometry = lib.ospNewGeometry(b'mesh')
-defer(lib.ospRelease, geometry)
-lib.ospSetObject(geometry, b'vertex.position', position)
-lib.ospSetObject(geometry, b'vertex.texcoord', texcoord)
-lib.ospSetObject(geometry, b'index', index)
-lib.ospCommit(geometry)
+    #%%
 
+    triangle = \
+    instance = lib.ospNewInstance(None)
+    defer(lib.ospRelease, instance)
+    lib.ospSetObject(instance, b'group', group)
+    lib.ospCommit(instance)
 
-#%%
 
+    #%%
 
-print('a')
-rgb = Noise(config.resolution)
-print('a1', flush=True)
+    position = StaticData(plane_position, type=lib.OSP_VEC3F, gpu=config.gpu)
 
-# XXX: The bug occurs right here.
-rgb = Data(rgb, type=lib.OSP_VEC3F)
 
+    #%%
 
-print('a2', flush=True)
-defer(lib.ospRelease, rgb)
-print('a3', flush=True)
-lib.ospCommit(rgb)
+    texcoord = StaticData(plane_texcoord, type=lib.OSP_VEC2F, gpu=config.gpu)
 
-print('b', flush=True)
-texture = lib.ospNewTexture(b'texture2d')
-defer(lib.ospRelease, texture)
-lib.ospSetObject(texture, b'data', rgb)
-lib.ospSetUInt(texture, b'format', lib.OSP_TEXTURE_RGB32F)
-lib.ospCommit(texture)
 
-print('c', flush=True)
-material = lib.ospNewMaterial(b'obj')
-defer(lib.ospRelease, material)
-lib.ospSetObject(material, b'map_kd', texture)
-# lib.ospSetVec3f(material, b'kd', *tint)
-lib.ospCommit(material)
+    #%%
 
+    index = StaticData(plane_index, type=lib.OSP_VEC4UI, gpu=config.gpu)
 
-#%%
 
-geomodel = lib.ospNewGeometricModel(None)
-defer(lib.ospRelease, geomodel)
-lib.ospSetObject(geomodel, b'geometry', geometry)
-lib.ospSetObject(geomodel, b'material', material)
-lib.ospCommit(geomodel)
+    #%%
 
+    geometry = lib.ospNewGeometry(b'mesh')
+    defer(lib.ospRelease, geometry)
+    lib.ospSetObject(geometry, b'vertex.position', position)
+    lib.ospSetObject(geometry, b'vertex.texcoord', texcoord)
+    lib.ospSetObject(geometry, b'index', index)
+    lib.ospCommit(geometry)
 
-#%%
 
-geomodels = Data([
-    geomodel,
-], type=lib.OSP_GEOMETRIC_MODEL)
-defer(lib.ospRelease, geomodels)
-lib.ospCommit(geomodels)
+    #%%
 
 
-#%%
+    print('a')
+    N = config.resolution
+    rgb = Noise(N, out=staging[:N * N * 3].reshape(N, N, 3))
+    print('a1', flush=True)
 
-group = lib.ospNewGroup()
-defer(lib.ospRelease, group)
-lib.ospSetObject(group, b'geometry', geomodels)
-lib.ospCommit(group)
+    # XXX: The bug occurs right here.
+    rgb = TextureData(rgb, type=lib.OSP_VEC3F)
 
 
-#%%
+    print('a2', flush=True)
+    defer(lib.ospRelease, rgb)
+    print('a3', flush=True)
 
-plane = \
-instance = lib.ospNewInstance(None)
-defer(lib.ospRelease, instance)
-lib.ospSetObject(instance, b'group', group)
-lib.ospCommit(instance)
+    print('b', flush=True)
+    texture = lib.ospNewTexture(b'texture2d')
+    defer(lib.ospRelease, texture)
+    lib.ospSetObject(texture, b'data', rgb)
+    lib.ospSetUInt(texture, b'format', lib.OSP_TEXTURE_RGB32F)
+    lib.ospCommit(texture)
 
+    print('c', flush=True)
+    material = lib.ospNewMaterial(b'obj')
+    defer(lib.ospRelease, material)
+    lib.ospSetObject(material, b'map_kd', texture)
+    # lib.ospSetVec3f(material, b'kd', *tint)
+    lib.ospCommit(material)
 
-#%%
 
-instances = Data([
-    triangle,
-    plane,
-], type=lib.OSP_INSTANCE)
-defer(lib.ospRelease, instances)
-lib.ospCommit(instances)
+    #%%
 
+    geomodel = lib.ospNewGeometricModel(None)
+    defer(lib.ospRelease, geomodel)
+    lib.ospSetObject(geomodel, b'geometry', geometry)
+    lib.ospSetObject(geomodel, b'material', material)
+    lib.ospCommit(geomodel)
 
-# %%
 
-light = lib.ospNewLight(b'ambient')
-defer(lib.ospRelease, light)
-lib.ospSetVec3f(light, b'color', 1.0, 1.0, 1.0)
-lib.ospSetFloat(light, b'intensity', 0.5)
-lib.ospCommit(light)
+    #%%
 
+    geomodels = ObjectData([
+        geomodel,
+    ], type=lib.OSP_GEOMETRIC_MODEL, owner=stack)
+    defer(lib.ospRelease, geomodels)
 
-# %%
 
-lights = Data([
-    light,
-], type=lib.OSP_LIGHT)
-defer(lib.ospRelease, lights)
-lib.ospCommit(lights)
+    #%%
 
+    group = lib.ospNewGroup()
+    defer(lib.ospRelease, group)
+    lib.ospSetObject(group, b'geometry', geomodels)
+    lib.ospCommit(group)
 
-#%%
 
-world = lib.ospNewWorld()
-defer(lib.ospRelease, world)
-lib.ospSetObject(world, b'instance', instances)
-lib.ospSetObject(world, b'light', lights)
-lib.ospCommit(world)
+    #%%
 
+    plane = \
+    instance = lib.ospNewInstance(None)
+    defer(lib.ospRelease, instance)
+    lib.ospSetObject(instance, b'group', group)
+    lib.ospCommit(instance)
 
-#%%
 
-renderer = lib.ospNewRenderer(b'scivis')
-defer(lib.ospRelease, renderer)
-lib.ospSetInt(renderer, b'pixelSamples', 1)
-lib.ospSetVec4f(renderer, b'backgroundColor', *(
-    0.8, 0.2, 0.2, 1.0,
-))
-lib.ospCommit(renderer)
+    #%%
 
+    instances = ObjectData([
+        triangle,
+        plane,
+    ], type=lib.OSP_INSTANCE, owner=stack)
+    defer(lib.ospRelease, instances)
 
-#%%
 
-camera = lib.ospNewCamera(b'orthographic')
-defer(lib.ospRelease, camera)
-lib.ospSetFloat(camera, b'height', 1.02)
-lib.ospSetVec3f(camera, b'position', *(
-    # 595.904, -3763.495, 5230.185,
-    0.5, 0.5, 1.0,
-))
-lib.ospSetVec3f(camera, b'direction', *(
-    # -595.904, 3763.495, -5230.185,
-    0, 0, -1,
-))
-lib.ospSetVec3f(camera, b'up', *(
-    0.000, 1.000, 0.000,
-))
-lib.ospCommit(camera)
+    # %%
 
+    light = lib.ospNewLight(b'ambient')
+    defer(lib.ospRelease, light)
+    lib.ospSetVec3f(light, b'color', 1.0, 1.0, 1.0)
+    lib.ospSetFloat(light, b'intensity', 0.5)
+    lib.ospCommit(light)
 
-#%%
 
-framebuffer = lib.ospNewFrameBuffer(
-    (w := 512),
-    (h := 512),
-    lib.OSP_FB_SRGBA,
-    lib.OSP_FB_COLOR,
-)
-defer(lib.ospRelease, framebuffer)
-lib.ospCommit(framebuffer)
+    # %%
 
+    lights = ObjectData([
+        light,
+    ], type=lib.OSP_LIGHT, owner=stack)
+    defer(lib.ospRelease, lights)
 
-#%%
 
-_variance: float = lib.ospRenderFrameBlocking(
-    framebuffer,
-    renderer,
-    camera,
-    world,
-)
+    #%%
 
-rgba = lib.ospMapFrameBuffer(framebuffer, lib.OSP_FB_COLOR)
-image = PIL.Image.frombytes(
-    'RGBA',
-    (w, h),
-    ctypes.string_at(rgba, size=(w * h * 4)),
-    'raw',
-    'RGBA',
-    0,
-    1,
-)
-image.load()
+    world = lib.ospNewWorld()
+    defer(lib.ospRelease, world)
+    lib.ospSetObject(world, b'instance', instances)
+    lib.ospSetObject(world, b'light', lights)
+    lib.ospCommit(world)
 
-image.save(
-    (path := pathlib.Path('image.png').resolve()),
-    'PNG',
-)
-print(f'Wrote {path.stat().st_size:,d} bytes to {path}')
 
-lib.ospUnmapFrameBuffer(rgba, framebuffer)
+    #%%
+
+    renderer = lib.ospNewRenderer(b'scivis')
+    defer(lib.ospRelease, renderer)
+    lib.ospSetInt(renderer, b'pixelSamples', 1)
+    lib.ospSetVec4f(renderer, b'backgroundColor', *(
+        0.8, 0.2, 0.2, 1.0,
+    ))
+    lib.ospCommit(renderer)
+
+
+    #%%
+
+    camera = lib.ospNewCamera(b'orthographic')
+    defer(lib.ospRelease, camera)
+    lib.ospSetFloat(camera, b'height', 1.02)
+    lib.ospSetVec3f(camera, b'position', *(
+        # 595.904, -3763.495, 5230.185,
+        0.5, 0.5, 1.0,
+    ))
+    lib.ospSetVec3f(camera, b'direction', *(
+        # -595.904, 3763.495, -5230.185,
+        0, 0, -1,
+    ))
+    lib.ospSetVec3f(camera, b'up', *(
+        0.000, 1.000, 0.000,
+    ))
+    lib.ospCommit(camera)
+
+
+    #%%
+
+    key = (config.gpu, (w := 512), (h := 512))
+    if key not in framebuffers:
+        framebuffer = lib.ospNewFrameBuffer(
+            w,
+            h,
+            lib.OSP_FB_SRGBA,
+            lib.OSP_FB_COLOR,
+        )
+        lib.ospCommit(framebuffer)
+
+        framebuffers[key] = framebuffer
+
+    framebuffer = framebuffers[key]
+    lib.ospResetAccumulation(framebuffer)
+
+
+    #%%
+
+    _variance: float = lib.ospRenderFrameBlocking(
+        framebuffer,
+        renderer,
+        camera,
+        world,
+    )
+
+    rgba = lib.ospMapFrameBuffer(framebuffer, lib.OSP_FB_COLOR)
+    defer(lib.ospUnmapFrameBuffer, rgba, framebuffer)
+
+    pixels = np.asarray(MappedFrameBuffer(rgba, w, h))
+    image = PIL.Image.fromarray(pixels)
+
+    image.save(
+        (path := pathlib.Path(f'image_{name}.png').resolve()),
+        'PNG',
+    )
+    print(f'Wrote {path.stat().st_size:,d} bytes to {path}')
+
+    # Both names view OSPRay's mapped memory, which the deferred unmap frees.
+    del image, pixels
+
+
+    #%%
+
+    stack.close()
 
 
 #%%
 
-stack.close()
+for (gpu, _w, _h), framebuffer in framebuffers.items():
+    lib.ospSetCurrentDevice(devices[gpu])
+    lib.ospRelease(framebuffer)
+
+for (gpu, _id, _type), data in static.items():
+    lib.ospSetCurrentDevice(devices[gpu])
+    lib.ospRelease(data)
+
+session.close()